@@ -1,18 +1,64 @@
 import argparse
 import datetime as dt
+import functools
+import gzip
+import http.client
+import io
 import json
 import os
+import re
 import sqlite3
 import ssl
 import sys
+import threading
 import urllib.parse
 import urllib.request
-import xml.etree.ElementTree as ET
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+try:
+    from lxml import etree as ET  # type: ignore
+
+    # The feed comes off the network: never expand entities or fetch external resources.
+    ITERPARSE_KWARGS = {"resolve_entities": False, "no_network": True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    ITERPARSE_KWARGS = {}
+
+try:
+    import requests  # type: ignore
+except ImportError:
+    requests = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None
 
 BASE_URL = "https://export.arxiv.org/api/query"
+USER_AGENT = "daily-arxiv-paper/0.1"
 ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
 
+_ATOM = "{" + ATOM_NS["atom"] + "}"
+T_ENTRY = _ATOM + "entry"
+T_TITLE = _ATOM + "title"
+T_SUMMARY = _ATOM + "summary"
+T_ID = _ATOM + "id"
+T_PUBLISHED = _ATOM + "published"
+T_UPDATED = _ATOM + "updated"
+T_LINK = _ATOM + "link"
+T_AUTHOR = _ATOM + "author"
+T_NAME = _ATOM + "name"
+
+_WS_RE = re.compile(r"\s+")
+
 
 def repo_root() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -55,6 +101,7 @@ def build_query(category: str, from_dt: dt.datetime, to_dt: dt.datetime) -> str:
     return f"cat:{category} AND submittedDate:[{from_str} TO {to_str}]"
 
 
+@functools.lru_cache(maxsize=1)
 def ssl_context() -> ssl.SSLContext:
     ctx = ssl.create_default_context()
     try:
@@ -66,72 +113,166 @@ def ssl_context() -> ssl.SSLContext:
     return ctx
 
 
-def urlopen_request(req: urllib.request.Request, use_proxy: bool) -> bytes:
-    if use_proxy:
-        with urllib.request.urlopen(req, timeout=20, context=ssl_context()) as resp:
-            return resp.read()
+def read_body(resp: http.client.HTTPResponse) -> bytes:
+    data = resp.read()
+    if resp.headers.get("Content-Encoding") == "gzip":
+        return gzip.decompress(data)
+    return data
+
 
-    opener = urllib.request.build_opener(
+@functools.lru_cache(maxsize=1)
+def direct_opener() -> urllib.request.OpenerDirector:
+    return urllib.request.build_opener(
         urllib.request.ProxyHandler({}),
         urllib.request.HTTPSHandler(context=ssl_context()),
     )
-    with opener.open(req, timeout=20) as resp:
-        return resp.read()
+
+
+def urlopen_request(req: urllib.request.Request, use_proxy: bool) -> bytes:
+    if use_proxy:
+        with urllib.request.urlopen(req, timeout=20, context=ssl_context()) as resp:
+            return read_body(resp)
+
+    with direct_opener().open(req, timeout=20) as resp:
+        return read_body(resp)
+
+
+if requests is not None:
+
+    class SSLContextAdapter(requests.adapters.HTTPAdapter):
+        # Verify TLS with ssl_context() (system CAs plus certifi), like the urllib path,
+        # instead of requests' bundled certifi alone.
+
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            kwargs["ssl_context"] = ssl_context()
+            super().init_poolmanager(*args, **kwargs)
+
+        def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+            proxy_kwargs["ssl_context"] = ssl_context()
+            return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+        def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:
+            super().cert_verify(conn, url, verify, cert)
+            if verify is True:
+                # Don't load requests' default bundle into the shared context on every
+                # connection; an explicit bundle (e.g. REQUESTS_CA_BUNDLE) is still added.
+                conn.ca_certs = None
+                conn.ca_cert_dir = None
+
+
+_LOCAL = threading.local()
+
+
+def http_session() -> "requests.Session":
+    # requests.Session is not documented as thread-safe, so each thread (e.g. the fetch_many
+    # workers) keeps its own; connections are still reused across calls on that thread.
+    session = getattr(_LOCAL, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        session.mount("https://", SSLContextAdapter())
+        _LOCAL.session = session
+    return session
+
+
+def session_proxies(use_proxy: bool) -> Optional[dict]:
+    # Per-request override that ignores proxy env vars, like ProxyHandler({}) on the urllib
+    # path. A fresh dict each time: requests setdefault()s environment proxies into it.
+    if use_proxy:
+        return None
+    return {"http": None, "https": None, "all": None}
 
 
 def fetch_atom(params: dict, use_proxy: bool) -> bytes:
+    if requests is not None:
+        resp = http_session().get(
+            BASE_URL, params=params, proxies=session_proxies(use_proxy), timeout=20
+        )
+        resp.raise_for_status()
+        return resp.content
     url = BASE_URL + "?" + urllib.parse.urlencode(params)
-    req = urllib.request.Request(url, headers={"User-Agent": "daily-arxiv-paper/0.1"})
+    req = urllib.request.Request(
+        url, headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    )
     return urlopen_request(req, use_proxy)
 
 
 def parse_entries(xml_bytes: bytes) -> list[dict]:
-    root = ET.fromstring(xml_bytes)
     entries = []
-    for e in root.findall("atom:entry", ATOM_NS):
-        title = (e.findtext("atom:title", default="", namespaces=ATOM_NS) or "").strip()
-        summary = (e.findtext("atom:summary", default="", namespaces=ATOM_NS) or "").strip()
-        id_url = (e.findtext("atom:id", default="", namespaces=ATOM_NS) or "").strip()
-        published = (e.findtext("atom:published", default="", namespaces=ATOM_NS) or "").strip()
-        updated = (e.findtext("atom:updated", default="", namespaces=ATOM_NS) or "").strip()
-        link_url = ""
-        for link in e.findall("atom:link", ATOM_NS):
-            if link.get("rel") == "alternate":
-                link_url = link.get("href") or ""
-                break
+    for _, e in ET.iterparse(io.BytesIO(xml_bytes), events=("end",), **ITERPARSE_KWARGS):
+        if e.tag != T_ENTRY:
+            continue
+        title = summary = id_url = published = updated = link_url = ""
         authors = []
-        for a in e.findall("atom:author", ATOM_NS):
-            name = (a.findtext("atom:name", default="", namespaces=ATOM_NS) or "").strip()
-            if name:
-                authors.append(name)
+        for child in e:
+            tag = child.tag
+            if tag == T_TITLE:
+                title = child.text.strip() if child.text else ""
+            elif tag == T_SUMMARY:
+                summary = child.text.strip() if child.text else ""
+            elif tag == T_ID:
+                id_url = child.text.strip() if child.text else ""
+            elif tag == T_PUBLISHED:
+                published = child.text.strip() if child.text else ""
+            elif tag == T_UPDATED:
+                updated = child.text.strip() if child.text else ""
+            elif tag == T_LINK:
+                if not link_url and child.get("rel") == "alternate":
+                    link_url = child.get("href", "")
+            elif tag == T_AUTHOR:
+                for a in child:
+                    if a.tag == T_NAME and a.text and (name := a.text.strip()):
+                        authors.append(name)
         arxiv_id = id_url.rsplit("/", 1)[-1] if id_url else ""
+        title = _WS_RE.sub(" ", title)
+        summary = _WS_RE.sub(" ", summary)
         entries.append(
             {
                 "id": arxiv_id,
-                "title": " ".join(title.split()),
-                "summary": " ".join(summary.split()),
+                "title": title,
+                "summary": summary,
                 "url": link_url or id_url,
                 "authors": authors,
                 "published": published,
                 "updated": updated,
+                # Lowercased once here so keyword filtering does not re-fold per call.
+                "_lower_blob": f"{title}\n{summary}".lower(),
             }
         )
+        e.clear()
     return entries
 
 
-def keyword_match(text: str, keywords: list[str]) -> bool:
-    text_l = text.lower()
+def lower_blob(entry: dict) -> str:
+    blob = entry.get("_lower_blob")
+    if blob is None:
+        blob = f"{entry['title']}\n{entry['summary']}".lower()
+    return blob
+
+
+def keyword_automaton(keywords: list[str]) -> "ahocorasick.Automaton":
+    automaton = ahocorasick.Automaton()
     for kw in keywords:
-        if kw.lower() in text_l:
-            return True
-    return False
+        automaton.add_word(kw.lower(), kw)
+    automaton.make_automaton()
+    return automaton
 
 
 def filter_entries(entries: list[dict], keywords: list[str]) -> list[dict]:
+    # Empty keywords are ignored on both paths (the automaton cannot hold an empty word).
+    keywords = [kw for kw in keywords if kw]
     out = []
+    if ahocorasick is not None and keywords:
+        automaton = keyword_automaton(keywords)
+        for e in entries:
+            for _ in automaton.iter(lower_blob(e)):
+                out.append(e)
+                break
+        return out
+    kws_lower = tuple(kw.lower() for kw in keywords)
     for e in entries:
-        blob = f"{e['title']}\n{e['summary']}"
-        if keyword_match(blob, keywords):
+        blob = lower_blob(e)
+        if any(kw in blob for kw in kws_lower):
             out.append(e)
     return out
 
@@ -165,8 +306,24 @@ def format_message(
     return header + "\n\n" + "\n\n".join(blocks)
 
 
+def dumps_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
 def send_slack(webhook_url: str, text: str, use_proxy: bool) -> None:
-    payload = json.dumps({"text": text}).encode("utf-8")
+    payload = dumps_json({"text": text})
+    if requests is not None:
+        resp = http_session().post(
+            webhook_url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            proxies=session_proxies(use_proxy),
+            timeout=20,
+        )
+        resp.raise_for_status()
+        return
     req = urllib.request.Request(
         webhook_url, data=payload, headers={"Content-Type": "application/json"}
     )
@@ -177,9 +334,19 @@ def db_path(root: str) -> str:
     return os.path.join(root, "data", "arxiv.db")
 
 
+def has_fts(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stars_fts'"
+    ).fetchone()
+    return row is not None
+
+
 def init_db(root: str) -> sqlite3.Connection:
     os.makedirs(os.path.join(root, "data"), exist_ok=True)
     conn = sqlite3.connect(db_path(root))
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
     conn.execute(
         """
         CREATE TABLE IF NOT EXISTS stars (
@@ -191,15 +358,100 @@ def init_db(root: str) -> sqlite3.Connection:
         )
         """
     )
+    # Lets cmd_list stream newest-first; cmd_search's FTS join still sorts its (few) matches.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_stars_added_at ON stars (added_at DESC)")
+    # INSERT OR REPLACE only fires the delete trigger below with recursive triggers on.
+    conn.execute("PRAGMA recursive_triggers = ON")
+    fts_existed = has_fts(conn)
+    # stars_fts_map gives each star a stable integer FTS rowid, so the triggers delete by
+    # rowid instead of scanning the FTS table for an id.
+    try:
+        conn.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS stars_fts USING fts5(title, abstract);
+            CREATE TABLE IF NOT EXISTS stars_fts_map (
+                fts_rowid INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL
+            );
+            CREATE TRIGGER IF NOT EXISTS stars_ai AFTER INSERT ON stars BEGIN
+                INSERT INTO stars_fts_map (id) VALUES (new.id);
+                INSERT INTO stars_fts (rowid, title, abstract)
+                SELECT fts_rowid, new.title, new.abstract FROM stars_fts_map WHERE id = new.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS stars_ad AFTER DELETE ON stars BEGIN
+                DELETE FROM stars_fts
+                WHERE rowid = (SELECT fts_rowid FROM stars_fts_map WHERE id = old.id);
+                DELETE FROM stars_fts_map WHERE id = old.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS stars_au AFTER UPDATE ON stars BEGIN
+                DELETE FROM stars_fts
+                WHERE rowid = (SELECT fts_rowid FROM stars_fts_map WHERE id = old.id);
+                UPDATE stars_fts_map SET id = new.id WHERE id = old.id;
+                INSERT INTO stars_fts (rowid, title, abstract)
+                SELECT fts_rowid, new.title, new.abstract FROM stars_fts_map WHERE id = new.id;
+            END;
+            """
+        )
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5: starring still works and cmd_search falls back to LIKE.
+        pass
+    else:
+        if not fts_existed:
+            # Index rows starred before the FTS table existed.
+            conn.executescript(
+                """
+                INSERT OR IGNORE INTO stars_fts_map (id) SELECT id FROM stars;
+                INSERT INTO stars_fts (rowid, title, abstract)
+                SELECT m.fts_rowid, s.title, s.abstract
+                FROM stars s JOIN stars_fts_map m ON m.id = s.id;
+                """
+            )
     conn.commit()
     return conn
 
 
+def star_many(conn: sqlite3.Connection, entries: list[dict]) -> None:
+    added_at = dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO stars (id, title, url, abstract, added_at) VALUES (?, ?, ?, ?, ?)",
+            [(e["id"], e["title"], e["url"], e["summary"], added_at) for e in entries],
+        )
+
+
+FETCH_CACHE_SIZE = 512
+_FETCHED: OrderedDict[tuple[str, bool], dict] = OrderedDict()
+_FETCHED_LOCK = threading.Lock()
+
+
 def fetch_by_id(arxiv_id: str, use_proxy: bool) -> Optional[dict]:
-    params = {"id_list": arxiv_id}
-    xml_bytes = fetch_atom(params, use_proxy)
-    entries = parse_entries(xml_bytes)
-    return entries[0] if entries else None
+    # Only hits are memoized (LRU, bounded), so an empty and possibly transient response is
+    # retried next time. The lock guards the cache against concurrent fetch_many workers.
+    key = (arxiv_id, use_proxy)
+    with _FETCHED_LOCK:
+        entry = _FETCHED.get(key)
+        if entry is not None:
+            _FETCHED.move_to_end(key)
+    if entry is None:
+        params = {"id_list": arxiv_id}
+        xml_bytes = fetch_atom(params, use_proxy)
+        entries = parse_entries(xml_bytes)
+        if not entries:
+            return None
+        entry = entries[0]
+        with _FETCHED_LOCK:
+            _FETCHED[key] = entry
+            if len(_FETCHED) > FETCH_CACHE_SIZE:
+                _FETCHED.popitem(last=False)
+    return dict(entry, authors=list(entry["authors"]))
+
+
+def fetch_many(arxiv_ids: list[str], use_proxy: bool) -> list[Optional[dict]]:
+    if len(arxiv_ids) <= 1:
+        return [fetch_by_id(i, use_proxy) for i in arxiv_ids]
+    # Each lookup is a network round-trip; run them concurrently, one session per worker.
+    with ThreadPoolExecutor(max_workers=min(8, len(arxiv_ids))) as ex:
+        return list(ex.map(lambda i: fetch_by_id(i, use_proxy), arxiv_ids))
 
 
 def cmd_fetch(args: argparse.Namespace) -> int:
@@ -237,23 +489,17 @@ def cmd_star(args: argparse.Namespace) -> int:
     root = repo_root()
     cfg = load_config(os.path.join(root, "config.json"))
     conn = init_db(root)
-    entry = fetch_by_id(args.arxiv_id, cfg["use_proxy"])
-    if not entry:
-        print("Paper not found.", file=sys.stderr)
-        return 1
-    conn.execute(
-        "INSERT OR REPLACE INTO stars (id, title, url, abstract, added_at) VALUES (?, ?, ?, ?, ?)",
-        (
-            entry["id"],
-            entry["title"],
-            entry["url"],
-            entry["summary"],
-            dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
-        ),
-    )
-    conn.commit()
-    print(f"Starred {entry['id']}: {entry['title']}")
-    return 0
+    found = []
+    for arxiv_id, entry in zip(args.arxiv_ids, fetch_many(args.arxiv_ids, cfg["use_proxy"])):
+        if entry:
+            found.append(entry)
+        else:
+            print(f"Paper not found: {arxiv_id}", file=sys.stderr)
+    if found:
+        star_many(conn, found)
+    for entry in found:
+        print(f"Starred {entry['id']}: {entry['title']}")
+    return 0 if len(found) == len(args.arxiv_ids) else 1
 
 
 def cmd_list(args: argparse.Namespace) -> int:
@@ -271,19 +517,44 @@ def cmd_list(args: argparse.Namespace) -> int:
     return 0
 
 
+def fts_query(text: str) -> str:
+    # Quote each term so user input is never parsed as FTS5 syntax; prefix-match every term.
+    terms = ['"' + t.replace('"', '""') + '"*' for t in text.split()]
+    return " ".join(terms)
+
+
 def cmd_search(args: argparse.Namespace) -> int:
     root = repo_root()
     conn = init_db(root)
-    q = f"%{args.query.lower()}%"
+    if not has_fts(conn):
+        q = f"%{args.query.lower()}%"
+        cur = conn.execute(
+            """
+            SELECT id, title, url, added_at FROM stars
+            WHERE lower(title) LIKE ? OR lower(abstract) LIKE ?
+            ORDER BY added_at DESC
+            """,
+            (q, q),
+        )
+        return print_search_rows(cur.fetchall())
+    q = fts_query(args.query)
+    if not q:
+        print("No matches in stars.")
+        return 0
     cur = conn.execute(
         """
-        SELECT id, title, url, added_at FROM stars
-        WHERE lower(title) LIKE ? OR lower(abstract) LIKE ?
-        ORDER BY added_at DESC
+        SELECT s.id, s.title, s.url, s.added_at FROM stars_fts f
+        JOIN stars_fts_map m ON m.fts_rowid = f.rowid
+        JOIN stars s ON s.id = m.id
+        WHERE stars_fts MATCH ?
+        ORDER BY s.added_at DESC
         """,
-        (q, q),
+        (q,),
     )
-    rows = cur.fetchall()
+    return print_search_rows(cur.fetchall())
+
+
+def print_search_rows(rows: list[tuple]) -> int:
     if not rows:
         print("No matches in stars.")
         return 0
@@ -301,8 +572,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_fetch.add_argument("--dry-run", action="store_true")
     p_fetch.set_defaults(func=cmd_fetch)
 
-    p_star = sub.add_parser("star", help="Star a paper by arXiv id")
-    p_star.add_argument("arxiv_id")
+    p_star = sub.add_parser("star", help="Star papers by arXiv id")
+    p_star.add_argument("arxiv_ids", nargs="+", metavar="arxiv_id")
     p_star.set_defaults(func=cmd_star)
 
     p_list = sub.add_parser("list", help="List starred papers")